@@ -3,15 +3,25 @@
 # synthesized beep/boop sounds (no external files), no leaderboard.
 
 import math
+import random
 import sys
-import time
 import pygame
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; run the physics kernel as plain Python without it
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 # Window / game constants
 WIN_W, WIN_H = 800, 600
 FPS = 60
 DT = 1.0 / 60.0
+MAX_FRAME = 0.25  # longest frame time fed to the physics accumulator
 
 PADDLE_W, PADDLE_H = 100, 14
 PADDLE_Y = 560
@@ -26,26 +36,48 @@ BRICK_H = 22
 BRICK_TOP = 80
 BRICK_LEFT = 65
 BRICK_GAP = 6
+BRICK_N = BRICK_ROWS * BRICK_COLS
+
+# Brick geometry as flat arrays, index = r * BRICK_COLS + c
+_brick_idx = np.arange(BRICK_N, dtype=np.int32)
+BRICK_X = BRICK_LEFT + (_brick_idx % BRICK_COLS) * (BRICK_W + BRICK_GAP)
+BRICK_Y = BRICK_TOP + (_brick_idx // BRICK_COLS) * (BRICK_H + BRICK_GAP)
+BRICK_X2 = BRICK_X + BRICK_W
+BRICK_Y2 = BRICK_Y + BRICK_H
+BRICK_POS = list(zip(BRICK_X.tolist(), BRICK_Y.tolist()))
 
 START_LIVES = 3
 
+# Physics events reported by physics_step (bit flags, several may fire)
+EV_NONE = 0
+EV_WALL = 1
+EV_PADDLE = 2
+EV_BRICK = 4
+EV_LOST = 8
+
 # Colors
 BG = (10, 10, 15)
 FG = (200, 220, 240)
 PADDLE_COL = (200, 200, 200)
 BALL_COL = (250, 250, 250)
 BLACK = (0, 0, 0)
+ROW_COLORS = [(40 + r * 35, min(255, 120 + r * 15), max(0, 180 - r * 20))
+              for r in range(BRICK_ROWS)]
 
 # Sound: synth simple tones so we don't need files
 def make_tone(freq=440.0, ms=50, vol=0.4, sample_rate=44100):
-    t = np.linspace(0, ms / 1000.0, int(sample_rate * ms / 1000.0), False)
+    n = int(sample_rate * ms / 1000.0)
+    t = np.arange(n, dtype=np.float32) * np.float32(1.0 / sample_rate)
     # Slightly percussive: sine * decay
-    wave = np.sin(2 * np.pi * freq * t) * np.exp(-6 * t)
-    wave *= vol
-    # Convert to 16-bit signed
-    audio = np.int16(wave * 32767)
-    stereo = np.column_stack((audio, audio))  # 2 channels
-    return pygame.sndarray.make_sound(stereo.copy())
+    wave = np.sin(np.float32(2 * np.pi * freq) * t)
+    wave *= np.exp(np.float32(-6.0) * t)
+    wave *= np.float32(vol * 32767)
+    # 16-bit signed stereo, both channels filled in place;
+    # make_sound copies the buffer itself
+    stereo = np.empty((n, 2), dtype=np.int16)
+    stereo[:, 0] = wave
+    stereo[:, 1] = stereo[:, 0]
+    return pygame.sndarray.make_sound(stereo)
 
 
 class Sounds:
@@ -60,55 +92,76 @@ class Sounds:
         self.start1 = make_tone(600, 60, 0.4)
         self.start2 = make_tone(800, 60, 0.4)
 
+        # One dedicated channel per effect so play() never has to search
+        # for a free one; the two jingle notes never overlap
+        pygame.mixer.set_num_channels(6)
+        self.wall_chan = pygame.mixer.Channel(0)
+        self.paddle_chan = pygame.mixer.Channel(1)
+        self.brick_chan = pygame.mixer.Channel(2)
+        self.lose_chan = pygame.mixer.Channel(3)
+        self.win_chan = pygame.mixer.Channel(4)
+        self.start_chan = pygame.mixer.Channel(5)
+
     def play_start(self):
-        self.start1.play()
+        self.start_chan.play(self.start1)
         # Slight stagger without blocking the loop too long
         pygame.time.set_timer(pygame.USEREVENT + 10, 80, True)
 
     def handle_event(self, e):
         if e.type == pygame.USEREVENT + 10:
-            self.start2.play()
+            self.start_chan.play(self.start2)
+
+
+def make_brick_surfaces():
+    # One prerendered surface per row, border baked in
+    surfs = []
+    for col in ROW_COLORS:
+        surf = pygame.Surface((BRICK_W, BRICK_H))
+        surf.fill(col)
+        pygame.draw.rect(surf, BLACK, surf.get_rect(), 1)
+        surfs.append(surf.convert())
+    return surfs
+
 
+def make_ball_surface():
+    surf = pygame.Surface((BALL_SIZE, BALL_SIZE), pygame.SRCALPHA)
+    pygame.draw.ellipse(surf, BALL_COL, surf.get_rect())
+    return surf.convert_alpha()
 
-def brick_rect(r, c):
-    x = BRICK_LEFT + c * (BRICK_W + BRICK_GAP)
-    y = BRICK_TOP + r * (BRICK_H + BRICK_GAP)
-    return pygame.Rect(x, y, BRICK_W, BRICK_H)
+
+def render_text(font, msg):
+    return font.render(msg, True, FG).convert_alpha()
 
 
 def reset_bricks():
-    return [[1 for _ in range(BRICK_COLS)] for _ in range(BRICK_ROWS)]
+    return np.ones(BRICK_N, dtype=np.uint8)
 
 
-def reset_ball_paddle(rng):
+def reset_ball_paddle():
     paddle = pygame.Rect((WIN_W - PADDLE_W) // 2, PADDLE_Y, PADDLE_W, PADDLE_H)
     ball = pygame.Rect(WIN_W // 2 - BALL_SIZE // 2, WIN_H // 2 + 60,
                        BALL_SIZE, BALL_SIZE)
-    ang = (math.pi / 4.0) + rng.random() * (math.pi / 2.0)
-    dir_sign = -1.0 if rng.random() < 0.5 else 1.0
+    ang = (math.pi / 4.0) + random.random() * (math.pi / 2.0)
+    dir_sign = -1.0 if random.random() < 0.5 else 1.0
     vx = math.cos(ang) * BALL_SPEED * dir_sign
     vy = -abs(math.sin(ang) * BALL_SPEED)
-    return paddle, ball, [vx, vy]
+    # Ball state for the physics kernel: [x, y, vx, vy], x/y in float
+    # pixels so slow velocity components are not truncated away each step
+    state = np.array([ball.x, ball.y, vx, vy], dtype=np.float64)
+    return paddle, ball, state
 
 
 def all_bricks_cleared(bricks):
-    for row in bricks:
-        for b in row:
-            if b:
-                return False
-    return True
-
-
-def intersects_ball_rect(ball, rect):
-    return ball.colliderect(rect)
+    return not bricks.any()
 
 
-def reflect_from_brick(ball, rb, vel):
+@njit(cache=True)
+def reflect_from_brick(x, y, vx, vy, i):
     # Compute penetration on four sides, flip the dominant axis
-    left_pen = rb.right - ball.left
-    right_pen = ball.right - rb.left
-    top_pen = rb.bottom - ball.top
-    bot_pen = ball.bottom - rb.top
+    left_pen = BRICK_X2[i] - x
+    right_pen = x + BALL_SIZE - BRICK_X[i]
+    top_pen = BRICK_Y2[i] - y
+    bot_pen = y + BALL_SIZE - BRICK_Y[i]
 
     # Pick the smallest penetration; tie-breaks are fine
     min_pen = left_pen
@@ -125,17 +178,78 @@ def reflect_from_brick(ball, rb, vel):
         nx, ny = 0, -1
 
     if nx != 0:
-        vel[0] = -vel[0]
+        vx = -vx
         if nx > 0:
-            ball.left = rb.right + 1
+            x = BRICK_X2[i] + 1
         else:
-            ball.right = rb.left - 1
+            x = BRICK_X[i] - 1 - BALL_SIZE
     if ny != 0:
-        vel[1] = -vel[1]
+        vy = -vy
         if ny > 0:
-            ball.top = rb.bottom + 1
+            y = BRICK_Y2[i] + 1
         else:
-            ball.bottom = rb.top - 1
+            y = BRICK_Y[i] - 1 - BALL_SIZE
+    return x, y, vx, vy
+
+
+@njit(cache=True)
+def physics_step(state, bricks, paddle_l):
+    """Advance the ball one fixed step.
+
+    Updates ``state`` and ``bricks`` in place and returns a bitmask of
+    EV_* flags. Sounds are left to the caller.
+    """
+    x, y, vx, vy = state[0], state[1], state[2], state[3]
+    events = EV_NONE
+
+    # Move ball; position stays sub-pixel, only the drawn rect is rounded
+    x += vx * DT
+    y += vy * DT
+
+    # Walls
+    if x <= 0:
+        x = 0
+        vx = abs(vx)
+        events |= EV_WALL
+    elif x + BALL_SIZE >= WIN_W:
+        x = WIN_W - BALL_SIZE
+        vx = -abs(vx)
+        events |= EV_WALL
+    if y <= 0:
+        y = 0
+        vy = abs(vy)
+        events |= EV_WALL
+
+    # Bottom: lose life
+    if y > WIN_H:
+        state[0], state[1], state[2], state[3] = x, y, vx, vy
+        return events | EV_LOST
+
+    # Paddle collision
+    if (x < paddle_l + PADDLE_W and x + BALL_SIZE > paddle_l
+            and y < PADDLE_Y + PADDLE_H and y + BALL_SIZE > PADDLE_Y
+            and vy > 0):
+        # Angle based on where it hits the paddle
+        hit = (x + BALL_SIZE // 2 - paddle_l) / float(PADDLE_W)
+        ang = (hit - 0.5) * (math.pi / 1.2)
+        speed = math.hypot(vx, vy)
+        vx = speed * math.sin(ang)
+        vy = -abs(speed * math.cos(ang))
+        y = PADDLE_Y - 1 - BALL_SIZE
+        events |= EV_PADDLE
+
+    # Bricks: first live brick overlapping the ball
+    for i in range(BRICK_N):
+        if (bricks[i] != 0
+                and BRICK_X[i] < x + BALL_SIZE and BRICK_X2[i] > x
+                and BRICK_Y[i] < y + BALL_SIZE and BRICK_Y2[i] > y):
+            x, y, vx, vy = reflect_from_brick(x, y, vx, vy, i)
+            bricks[i] = 0
+            events |= EV_BRICK
+            break
+
+    state[0], state[1], state[2], state[3] = x, y, vx, vy
+    return events
 
 
 def main():
@@ -150,36 +264,52 @@ def main():
         pygame.mixer.init()
     except Exception:
         pass
+    mixer_ok = bool(pygame.mixer.get_init())
 
-    screen = pygame.display.set_mode((WIN_W, WIN_H))
+    # SCALED goes through SDL's renderer; vsync is not available everywhere
+    flags = pygame.SCALED | pygame.DOUBLEBUF
+    try:
+        screen = pygame.display.set_mode((WIN_W, WIN_H), flags, vsync=1)
+    except pygame.error:
+        screen = pygame.display.set_mode((WIN_W, WIN_H), flags)
     pygame.display.set_caption("Breakout - One Shot Arcade (Python)")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont(None, 22)
 
-    rng = np.random.default_rng()
+    # Static text is rendered once; the info line only when it changes
+    hint_text = render_text(font, "Mouse to move | P=Pause | R=Reset")
+    paused_text = render_text(font, "PAUSED - Press P to resume")
+    win_text = render_text(font, "YOU WIN! Press R to play again")
+    lose_text = render_text(font, "GAME OVER - Press R to retry")
+    info_text = None
+    info_key = None
 
     sounds = Sounds()
+    brick_surfs = make_brick_surfaces()
+    ball_surf = make_ball_surface()
 
     bricks = reset_bricks()
-    paddle, ball, vel = reset_ball_paddle(rng)
+    brick_seq = None  # blit list for live bricks, rebuilt when one dies
+    paddle, ball, state = reset_ball_paddle()
     lives = START_LIVES
     score = 0
     paused = False
     game_over = False
     is_win = False
 
+    # Compile (or load from cache) the physics kernel now rather than on
+    # the first substep, so the stall does not turn into catch-up steps
+    physics_step(np.zeros(4), reset_bricks(), 0)
+
     sounds.play_start()
 
     acc = 0.0
-    last_time = time.perf_counter()
+    clock.tick()  # don't count startup time as the first frame
 
     running = True
     while running:
-        # Timing
-        now = time.perf_counter()
-        frame = now - last_time
-        last_time = now
-        acc += frame
+        # Timing: clock.tick caps the frame rate and returns elapsed ms
+        acc = min(acc + clock.tick(FPS) / 1000.0, MAX_FRAME)
 
         # Events
         for event in pygame.event.get():
@@ -192,7 +322,8 @@ def main():
                     paused = not paused
                 elif event.key == pygame.K_r:
                     bricks = reset_bricks()
-                    paddle, ball, vel = reset_ball_paddle(rng)
+                    brick_seq = None
+                    paddle, ball, state = reset_ball_paddle()
                     lives = START_LIVES
                     score = 0
                     paused = False
@@ -212,121 +343,81 @@ def main():
             if paddle.right > WIN_W:
                 paddle.right = WIN_W
 
-        # Fixed-step update
-        while acc >= DT:
-            if not paused and not game_over:
-                # Move ball
-                ball.x += int(vel[0] * DT)
-                ball.y += int(vel[1] * DT)
-
-                # Walls
-                if ball.left <= 0:
-                    ball.left = 0
-                    vel[0] = abs(vel[0])
-                    if pygame.mixer.get_init():
-                        sounds.wall.play()
-                elif ball.right >= WIN_W:
-                    ball.right = WIN_W
-                    vel[0] = -abs(vel[0])
-                    if pygame.mixer.get_init():
-                        sounds.wall.play()
-                if ball.top <= 0:
-                    ball.top = 0
-                    vel[1] = abs(vel[1])
-                    if pygame.mixer.get_init():
-                        sounds.wall.play()
-
-                # Bottom: lose life
-                if ball.top > WIN_H:
-                    lives -= 1
-                    if pygame.mixer.get_init():
-                        sounds.lose.play()
-                    if lives <= 0:
-                        game_over = True
-                        is_win = False
-                    else:
-                        paddle, ball, vel = reset_ball_paddle(rng)
-
-                # Paddle collision
-                if ball.colliderect(paddle) and vel[1] > 0:
-                    # Angle based on where it hits the paddle
-                    hit = (ball.centerx - paddle.left) / float(paddle.width)
-                    ang = (hit - 0.5) * (math.pi / 1.2)
-                    speed = math.hypot(vel[0], vel[1])
-                    vel[0] = speed * math.sin(ang)
-                    vel[1] = -abs(speed * math.cos(ang))
-                    ball.bottom = paddle.top - 1
-                    if pygame.mixer.get_init():
-                        sounds.paddle.play()
-
-                # Bricks
-                hit_brick = False
-                for r in range(BRICK_ROWS):
-                    if hit_brick:
-                        break
-                    for c in range(BRICK_COLS):
-                        if bricks[r][c] == 0:
-                            continue
-                        rb = brick_rect(r, c)
-                        if ball.colliderect(rb):
-                            reflect_from_brick(ball, rb, vel)
-                            bricks[r][c] = 0
-                            score += 10
-                            hit_brick = True
-                            if pygame.mixer.get_init():
-                                sounds.brick.play()
-                            if all_bricks_cleared(bricks):
-                                game_over = True
-                                is_win = True
-                                if pygame.mixer.get_init():
-                                    sounds.win.play()
-                            break
+        # Fixed-step update; drop accumulated time while stopped so
+        # resuming does not trigger a burst of catch-up steps
+        if paused or game_over:
+            acc = 0.0
+        while acc >= DT and not game_over:
+            events = physics_step(state, bricks, paddle.left)
+            ball.x = int(state[0])
+            ball.y = int(state[1])
+
+            if events & EV_WALL:
+                if mixer_ok:
+                    sounds.wall_chan.play(sounds.wall)
+
+            # Bottom: lose life
+            if events & EV_LOST:
+                lives -= 1
+                if mixer_ok:
+                    sounds.lose_chan.play(sounds.lose)
+                if lives <= 0:
+                    game_over = True
+                    is_win = False
+                else:
+                    paddle, ball, state = reset_ball_paddle()
+
+            if events & EV_PADDLE:
+                if mixer_ok:
+                    sounds.paddle_chan.play(sounds.paddle)
+
+            if events & EV_BRICK:
+                brick_seq = None
+                score += 10
+                if mixer_ok:
+                    sounds.brick_chan.play(sounds.brick)
+                if all_bricks_cleared(bricks):
+                    game_over = True
+                    is_win = True
+                    if mixer_ok:
+                        sounds.win_chan.play(sounds.win)
             acc -= DT
 
         # Draw
         screen.fill(BG)
 
         # Info line
-        info = f"Breakout 60FPS | Score: {score}  Lives: {lives}"
-        text = font.render(info, True, FG)
-        screen.blit(text, (10, 10))
-        hint = "Mouse to move | P=Pause | R=Reset"
-        hint_text = font.render(hint, True, FG)
+        if info_key != (score, lives):
+            info_key = (score, lives)
+            info = f"Breakout 60FPS | Score: {score}  Lives: {lives}"
+            info_text = render_text(font, info)
+        screen.blit(info_text, (10, 10))
         screen.blit(hint_text, (WIN_W - 265, 10))
 
         # Bricks
-        for r in range(BRICK_ROWS):
-            for c in range(BRICK_COLS):
-                if bricks[r][c]:
-                    rb = brick_rect(r, c)
-                    hue = 40 + r * 35
-                    col = (hue, min(255, 120 + r * 15),
-                           max(0, 180 - r * 20))
-                    pygame.draw.rect(screen, col, rb)
-                    pygame.draw.rect(screen, BLACK, rb, 1)
+        if brick_seq is None:
+            brick_seq = [(brick_surfs[i // BRICK_COLS], BRICK_POS[i])
+                         for i in np.flatnonzero(bricks).tolist()]
+        screen.blits(brick_seq, doreturn=False)
 
         # Paddle
         pygame.draw.rect(screen, PADDLE_COL, paddle)
 
         # Ball
-        pygame.draw.ellipse(screen, BALL_COL, ball)
+        screen.blit(ball_surf, ball)
 
         # Overlays
         if paused:
-            msg = "PAUSED - Press P to resume"
-            t = font.render(msg, True, FG)
+            t = paused_text
             screen.blit(t, (WIN_W // 2 - t.get_width() // 2,
                             WIN_H // 2 - 10))
 
         if game_over:
-            msg = "YOU WIN! Press R to play again" if is_win else \
-                  "GAME OVER - Press R to retry"
-            t = font.render(msg, True, FG)
+            t = win_text if is_win else lose_text
             screen.blit(t, (WIN_W // 2 - t.get_width() // 2,
                             WIN_H // 2 - 10))
 
         pygame.display.flip()
-        clock.tick(FPS)
 
     pygame.quit()
     return 0